@@ -2,13 +2,14 @@ from __future__ import annotations
 
 from .exceptions import InvalidMethodError, NotFoundError, RouterError
 from .router import Router
-from .routes import DynamicRoute, Mount, PrefixedRoute, Route
+from .routes import DynamicRoute, Mount, PrefixedRoute, Route, TailRoute
 
 __all__ = (
     "DynamicRoute",
     "Mount",
     "PrefixedRoute",
     "Route",
+    "TailRoute",
     "Router",
     "InvalidMethodError",
     "NotFoundError",
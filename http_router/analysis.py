@@ -0,0 +1,282 @@
+"""Find shadowed, duplicated and ambiguous routes."""
+
+from __future__ import annotations
+
+import re
+from itertools import chain, product
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Optional
+from uuid import UUID
+
+from .routes import DynamicRoute, Route, TailRoute
+from .utils import VAR_TYPES
+
+if TYPE_CHECKING:
+    from .router import Router
+
+# A later route is unreachable (it could be pruned)
+SHADOWED = "shadowed"
+DUPLICATE = "duplicate"
+# A later route is reachable only partially (some methods or paths are taken by another one)
+AMBIGUOUS = "ambiguous"
+
+CONVERTERS: dict[Callable, str] = {int: "int", float: "float", UUID: "uuid"}
+LITERALS = {
+    name: re.compile(regex) for name, (regex, _) in VAR_TYPES.items() if name != "path"
+}
+# Dynamic routes are grouped by the number of segments and the leading literals
+DEPTH = 2
+
+TSegments = list[tuple[str, str]]
+
+
+class RouteIssue:
+    """Keeping a route which is (partially) hidden by another one."""
+
+    __slots__ = "kind", "other", "route"
+
+    def __init__(self, kind: str, route: Route, other: Route):
+        self.kind = kind
+        self.route = route
+        self.other = other
+
+    def __repr__(self):
+        return f"<RouteIssue {self.kind}: {self.route.path} by {self.other.path}>"
+
+
+def segments(route: Route) -> Optional[TSegments]:
+    """Split the route template into typed segments: ``(type, name)`` or ``("", literal)``.
+
+    Return None when the route can't be analyzed (raw regexps, mixed segments).
+    """
+    if isinstance(route, TailRoute):
+        return [("", part) for part in route.prefix.split("/")[:-1]] + [("path", route.name)]
+
+    if not isinstance(route, DynamicRoute):
+        return [("", part) for part in route.path.split("/")]
+
+    params = route.params
+    if not params:
+        return None
+
+    result = []
+    for part in route.path.split("/"):
+        if "{" not in part and "}" not in part:
+            result.append(("", part))
+            continue
+
+        name = part[1:-1]
+        converter = params.get(name, None)
+        if part != f"{{{name}}}" or converter is None:
+            return None
+
+        if converter is str:
+            if f"(?P<{name}>{VAR_TYPES['path'][0]})" in route.pattern.pattern:
+                return None
+            result.append(("str", name))
+
+        else:
+            result.append((CONVERTERS.get(converter, "regex"), name))
+
+    return result
+
+
+def covers_segment(seg: tuple[str, str], other: tuple[str, str]) -> bool:
+    """Check that the segment matches everything the other one does."""
+    kind, value = seg
+    other_kind, other_value = other
+    if not kind:
+        return not other_kind and value == other_value
+
+    if not other_kind:
+        if kind == "int":
+            return other_value.isdecimal()
+        regex = LITERALS.get(kind)
+        return bool(regex and regex.fullmatch(other_value))
+
+    if kind == "str":
+        return other_kind in ("str", "int", "float", "uuid")
+
+    if kind == "float":
+        return other_kind in ("int", "float")
+
+    return kind == other_kind and kind != "regex"
+
+
+def covers(route: Route, other: Route) -> bool:
+    """Check that the route matches every path the other route does."""
+    return covers_segments(segments(route), segments(other))
+
+
+def covers_segments(segs: Optional[TSegments], other_segs: Optional[TSegments]) -> bool:
+    """Check that the segments match every path the other segments do."""
+    if segs is None or other_segs is None:
+        return False
+
+    if segs[-1][0] == "path":
+        return len(other_segs) >= len(segs) and all(
+            covers_segment(seg, other_seg) for seg, other_seg in zip(segs[:-1], other_segs)
+        )
+
+    return (
+        len(segs) == len(other_segs)
+        and other_segs[-1][0] != "path"
+        and all(covers_segment(seg, other_seg) for seg, other_seg in zip(segs, other_segs))
+    )
+
+
+def accepted_methods(route: Route) -> Optional[set[str]]:
+    """Get the methods accepted by the route (None means any).
+
+    Plain routes treat empty methods as "nothing", the other routes as "anything".
+    """
+    methods = route.methods
+    if type(route) is Route:
+        return None if methods is None else set(methods)
+
+    return set(methods) if methods else None
+
+
+def compare(route: Route, other: Route, *, same: bool) -> Optional[RouteIssue]:
+    """Compare a route with an earlier one which paths cover the route's paths."""
+    methods, other_methods = accepted_methods(route), accepted_methods(other)
+    if other_methods is None or (methods is not None and methods <= other_methods):
+        return RouteIssue(DUPLICATE if same else SHADOWED, route, other)
+
+    if methods is None or methods & other_methods:
+        return RouteIssue(AMBIGUOUS, route, other)
+
+    return None
+
+
+def compare_dynamic(
+    route: DynamicRoute,
+    other: DynamicRoute,
+    segs: Optional[TSegments],
+    other_segs: Optional[TSegments],
+) -> Optional[RouteIssue]:
+    """Compare a dynamic route with an earlier one (their segments are given)."""
+    if other.pattern == route.pattern and other.params == route.params:
+        return compare(route, other, same=True)
+
+    if covers_segments(other_segs, segs):
+        return compare(route, other, same=covers_segments(segs, other_segs))
+
+    return None
+
+
+def group_key(segs: TSegments) -> tuple:
+    return (len(segs), *(None if kind else value for kind, value in segs[:DEPTH]))
+
+
+def cover_keys(segs: TSegments) -> Iterator[tuple]:
+    """Get the group keys of the routes which could cover the segments."""
+    options = [(value, None) if not kind else (None,) for kind, value in segs[:DEPTH]]
+    for head in product(*options):
+        yield (len(segs), *head)
+
+
+class RouteIndex:
+    """Group the dynamic routes which could match the same paths.
+
+    Routes are compared only with the routes of the same size and a compatible literal
+    prefix, the routes which can't be analyzed only with the routes of the same pattern.
+    """
+
+    def __init__(self, routes: Iterable[Route] = ()):
+        self.size = 0
+        self.groups: dict[tuple, list[tuple[int, DynamicRoute, TSegments]]] = {}
+        self.patterns: dict[str, list[tuple[int, DynamicRoute, None]]] = {}
+        # Routes which may match paths of any size (raw regexps)
+        self.loose: list[tuple[int, DynamicRoute]] = []
+        for route in routes:
+            if isinstance(route, DynamicRoute):
+                self.add(route, segments(route))
+
+    def add(self, route: DynamicRoute, segs: Optional[TSegments]):
+        """Add the route (its segments are given)."""
+        pos = self.size
+        self.size += 1
+        if segs is None:
+            self.patterns.setdefault(route.pattern.pattern, []).append((pos, route, None))
+            self.loose.append((pos, route))
+            return
+
+        self.groups.setdefault(group_key(segs), []).append((pos, route, segs))
+        if any(kind == "regex" for kind, _ in segs):
+            self.loose.append((pos, route))
+
+    def check(self, route: DynamicRoute, segs: Optional[TSegments]) -> list[RouteIssue]:
+        """Compare the route with the indexed ones (it's going to be added last)."""
+        items: list[tuple[int, DynamicRoute, Optional[TSegments]]]
+        if segs is None:
+            items = list(self.patterns.get(route.pattern.pattern, ()))
+        else:
+            items = sorted(item for key in cover_keys(segs) for item in self.groups.get(key, ()))
+
+        return [
+            issue
+            for _, other, other_segs in items
+            if (issue := compare_dynamic(route, other, segs, other_segs))
+        ]
+
+    def candidates(self, path: str) -> list[DynamicRoute]:
+        """Get the routes which could match the plain path (in the order of adding)."""
+        segs = [("", part) for part in path.split("/")]
+        found = dict(self.loose)
+        for key in cover_keys(segs):
+            found.update((pos, route) for pos, route, _ in self.groups.get(key, ()))
+        return [found[pos] for pos in sorted(found)]
+
+
+def check_route(router: Router, route: Route) -> list[RouteIssue]:
+    """Check a route which is going to be added last against the router's routes."""
+    if isinstance(route, TailRoute):
+        candidates = router.tails.get(route.prefix, [])
+
+    elif isinstance(route, DynamicRoute):
+        index = router.index
+        if index is None:
+            index = router.index = RouteIndex(router.dynamic)
+        return index.check(route, segments(route))
+
+    else:
+        candidates = router.plain.get(route.path, [])
+
+    return [issue for other in candidates if (issue := compare(route, other, same=True))]
+
+
+def analyze(router: Router) -> list[RouteIssue]:
+    """Find shadowed, duplicated and ambiguous routes of the router."""
+    issues: list[RouteIssue] = []
+    for routes in router.plain.values():
+        for idx, route in enumerate(routes):
+            issues.extend(
+                issue for other in routes[:idx] if (issue := compare(route, other, same=True))
+            )
+
+    index = RouteIndex()
+    for route in router.dynamic:
+        if isinstance(route, DynamicRoute):
+            segs = segments(route)
+            issues.extend(index.check(route, segs))
+            index.add(route, segs)
+
+    for prefix, routes in router.tails.items():
+        if isinstance(prefix, str):
+            for idx, route in enumerate(routes):
+                issues.extend(
+                    issue
+                    for other in routes[:idx]
+                    if (issue := compare(route, other, same=True))
+                )
+
+    # Plain routes are checked first, they hide the dynamic routes for their paths
+    for path, routes in router.plain.items():
+        if routes:
+            issues.extend(
+                RouteIssue(AMBIGUOUS, route, routes[0])
+                for route in chain(index.candidates(path), router.tail_routes(path))
+                if route.match(path, "").path
+            )
+
+    return issues
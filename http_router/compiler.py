@@ -0,0 +1,309 @@
+"""Generate a specialized match function for a frozen route table."""
+
+from __future__ import annotations
+
+import hashlib
+import marshal
+import re
+import sys
+from contextlib import suppress
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union
+from urllib.parse import unquote
+
+from .analysis import segments
+from .routes import DynamicRoute, RouteMatch, TailRoute
+from .utils import VAR_TYPES
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from types import CodeType
+
+    from .router import Router
+
+FILENAME = "<http_router.compiler>"
+INLINE = {"", "str", "int", "float", "uuid"}
+UUID_RE = re.compile(VAR_TYPES["uuid"][0])
+
+
+def is_float(value: str) -> bool:
+    """Check the value the same way as the float type regexp does."""
+    head, dot, tail = value.partition(".")
+    return head.isdecimal() and (not dot or tail.isdecimal())
+
+
+def dispatch_position(items: Sequence[tuple[DynamicRoute, list]]) -> Optional[int]:
+    """Find the segment with the most distinct literals (None when there is no choice)."""
+    size = len(items[0][1])
+    values = [{segs[idx][1] for _, segs in items if not segs[idx][0]} for idx in range(size)]
+    pos = max(range(size), key=lambda idx: len(values[idx]))
+    return pos if len(values[pos]) > 1 else None
+
+
+class Generator:
+    """Build the source of a match function and the namespace it runs in."""
+
+    def __init__(self, router: Router):
+        self.router = router
+        self.lines: list[str] = []
+        # Module level definitions (dispatch tables and their branches)
+        self.helpers: list[str] = []
+        self.namespace: dict[str, Any] = {
+            "RouteMatch": RouteMatch,
+            "unquote": unquote,
+            "is_float": is_float,
+            "is_uuid": UUID_RE.fullmatch,
+            "fallback": router.match,
+        }
+
+    def const(self, value: Any, prefix: str = "c") -> str:
+        """Put a value into the namespace and get its name."""
+        name = f"{prefix}{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def emit(self, indent: int, *lines: str):
+        self.lines.extend("    " * indent + line for line in lines)
+
+    def emit_found(self, indent: int, call: str):
+        """Handle a route.match call result like Router.match does."""
+        self.emit(
+            indent,
+            f"found = {call}",
+            "if found.path:",
+            "    if found.method:",
+            "        return found",
+            "    neighbour = found",
+        )
+
+    def emit_result(self, indent: int, route: DynamicRoute, params: str):
+        """Return a full match or keep a neighbour for the given route."""
+        target = self.const(route.target, "t")
+        if not route.methods:
+            self.emit(indent, f"return RouteMatch(True, True, {target}, {params})")
+            return
+
+        methods = self.const(frozenset(route.methods), "m")
+        self.emit(
+            indent,
+            f"if method in {methods}:",
+            f"    return RouteMatch(True, True, {target}, {params})",
+            f"neighbour = RouteMatch(True, False, {target}, {params})",
+        )
+
+    def convert(self, route: DynamicRoute, name: str, value: str) -> str:
+        converter = route.params.get(name, str)
+        if converter is str:
+            return f"unquote({value})"
+        return f"{self.const(converter, 'p')}({value})"
+
+    def emit_dynamic(
+        self, indent: int, route: DynamicRoute, segs: list[tuple[str, str]], skip: int = -1,
+    ):
+        """Inline the segments checks of a dynamic route (the size is already checked).
+
+        :param skip: A literal segment which is already checked
+
+        """
+        literals, checks, params = [], [], []
+        for idx, (kind, value) in enumerate(segs):
+            part = f"parts[{idx}]"
+            if not kind:
+                if idx != skip:
+                    literals.append(f"{part} == {value!r}")
+                continue
+
+            checks.append(
+                {
+                    "str": part,
+                    "int": f"{part}.isdecimal()",
+                    "float": f"is_float({part})",
+                    "uuid": f"is_uuid({part})",
+                }[kind],
+            )
+            params.append(f"{value!r}: {self.convert(route, value, part)}")
+
+        self.emit(indent, f"if {' and '.join(literals + checks)}:  # {route.path!r}")
+        self.emit_result(indent + 1, route, f"{{{', '.join(params)}}}")
+
+    def emit_group(self, indent: int, items: Sequence[tuple[DynamicRoute, list]]):
+        """Inline the routes of the same size, dispatch them by a literal segment.
+
+        Consecutive routes with literals in the segment are looked up in a dictionary,
+        the order of the routes is kept.
+        """
+        pos = dispatch_position(items)
+        run: list[tuple[DynamicRoute, list]] = []
+        for item in [*items, None]:
+            if pos is not None and item is not None and not item[1][pos][0]:
+                run.append(item)
+                continue
+
+            if pos is not None and run:
+                self.emit_dispatch(indent, pos, run)
+                run = []
+
+            if item is not None:
+                self.emit_dynamic(indent, *item)
+
+    def emit_dispatch(self, indent: int, pos: int, items: list[tuple[DynamicRoute, list]]):
+        """Look up the routes by the literal segment, every literal gets a branch function."""
+        branches: dict[str, list[tuple[DynamicRoute, list]]] = {}
+        for route, segs in items:
+            branches.setdefault(segs[pos][1], []).append((route, segs))
+
+        if len(branches) < 2:
+            for item in items:
+                self.emit_dynamic(indent, *item)
+            return
+
+        lines, self.lines = self.lines, self.helpers
+        table = {}
+        for value, group in branches.items():
+            name = table[value] = self.const(None, "b")
+            self.emit(0, f"def {name}(parts, method):", "    neighbour = None")
+            for route, segs in group:
+                self.emit_dynamic(1, route, segs, skip=pos)
+            self.emit(0, "    return neighbour", "")
+
+        name = self.const(None, "d")
+        self.emit(0, f"{name} = {{{', '.join(f'{k!r}: {v}' for k, v in table.items())}}}", "")
+        self.lines = lines
+
+        self.emit(
+            indent,
+            f"branch = {name}.get(parts[{pos}])",
+            "if branch is not None:",
+            "    found = branch(parts, method)",
+            "    if found is not None:",
+            "        if found.method:",
+            "            return found",
+            "        neighbour = found",
+        )
+
+    def emit_tails(self, indent: int):
+        """Inline the tail routes, the longest prefixes first."""
+        tails = sorted(
+            ((key, routes) for key, routes in self.router.tails.items() if isinstance(key, str)),
+            key=lambda item: -len(item[0]),
+        )
+        for prefix, routes in tails:
+            if not routes:
+                continue
+
+            self.emit(indent, f"if path.startswith({prefix!r}):")
+            self.emit(indent + 1, f"value = path[{len(prefix)}:]")
+            for route in routes:
+                if type(route) is TailRoute:
+                    value = self.convert(route, route.name, "value")
+                    self.emit_result(indent + 1, route, f"{{{route.name!r}: {value}}}")
+                else:
+                    self.emit_found(indent + 1, f"{self.const(route.match, 'r')}(path, method)")
+
+    def generate(self) -> str:
+        router = self.router
+        plain = {path: tuple(routes) for path, routes in router.plain.items()}
+        guard = "type(path) is not str or path[-1:] == '\\n'"
+        if router.hosts or router.dynamic_hosts:
+            guard += " or host is not None"
+        if router.normalize:
+            guard += f" or {self.const(router.canonical, 'canonical')}(path) != path"
+
+        self.emit(
+            0,
+            "def match(path, method, host=None):",
+            # Raw paths, hosts, non-canonical paths and "$" before a trailing newline
+            # are left to the router
+            f"    if {guard}:",
+            "        found = fallback(path, method, host)",
+            "        return RouteMatch(False, False) if found is None else found",
+            "",
+            "    neighbour = None",
+            f"    routes = {self.const(plain.get, 'plain')}(path)",
+            "    if routes is not None:",
+            "        for route in routes:",
+        )
+        self.emit_found(3, "route.match(path, method)")
+        self.emit(
+            0,
+            "        return RouteMatch(False, False) if neighbour is None else neighbour",
+            "",
+            "    parts = path.split('/')",
+            "    size = len(parts)",
+        )
+
+        # Consecutive inlined routes are grouped by the number of segments:
+        # routes with different sizes never match the same path
+        group: dict[int, list[tuple[DynamicRoute, list]]] = {}
+        for route in [*router.dynamic, None]:
+            if isinstance(route, DynamicRoute) and type(route) is DynamicRoute:
+                segs = segments(route)
+                if segs and all(kind in INLINE for kind, _ in segs):
+                    group.setdefault(len(segs), []).append((route, segs))
+                    continue
+
+            for idx, (size, items) in enumerate(group.items()):
+                self.emit(1, f"{'el' if idx else ''}if size == {size}:")
+                self.emit_group(2, items)
+            group = {}
+
+            if route is not None:
+                self.emit_found(1, f"{self.const(route.match, 'r')}(path, method)")
+
+        self.emit_tails(1)
+        self.emit(1, "return RouteMatch(False, False) if neighbour is None else neighbour")
+        return "\n".join(self.helpers + self.lines) + "\n"
+
+
+def load_code(source: str, cache_dir: Optional[Union[str, Path]] = None) -> CodeType:
+    """Compile the source, the code could be cached on disk by the source hash."""
+    if cache_dir is None:
+        return compile(source, FILENAME, "exec")
+
+    key = hashlib.sha256(source.encode()).hexdigest()[:32]
+    tag = sys.implementation.cache_tag or "py"
+    path = Path(cache_dir) / f"http_router-{key}.{tag}.bin"
+    try:
+        return marshal.loads(path.read_bytes())  # noqa: S302
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    code = compile(source, FILENAME, "exec")
+    # The cache is best-effort (a read-only directory, a full disk)
+    with suppress(OSError):
+        save_code(code, path)
+    return code
+
+
+def save_code(code: CodeType, path: Path):
+    """Write the code atomically through a unique temporary file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as tmp:
+        try:
+            tmp.write(marshal.dumps(code))
+            tmp.close()
+            Path(tmp.name).replace(path)
+        except BaseException:
+            Path(tmp.name).unlink(missing_ok=True)
+            raise
+
+
+def compile_router(
+    router: Router, *, cache_dir: Optional[Union[str, Path]] = None,
+) -> Callable[..., RouteMatch]:
+    """Generate a match function specialized for the router's current routes.
+
+    The function returns the same results as ``Router.match`` (it isn't updated
+    when the router changes), missing paths always get a not found ``RouteMatch``.
+
+    :param cache_dir: Cache the compiled code on disk (keyed by the route table hash)
+
+    """
+    generator = Generator(router)
+    source = generator.generate()
+    namespace = generator.namespace
+    exec(load_code(source, cache_dir), namespace)  # noqa: S102
+    match = namespace["match"]
+    match.__source__ = source
+    return match
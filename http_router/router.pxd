@@ -4,8 +4,21 @@
 cdef class Router:
 
     cdef readonly dict plain
+    cdef readonly dict plain_raw
     cdef readonly list dynamic
+    cdef readonly dict tails
+    cdef readonly list tail_lengths
+    cdef readonly list raw_tail_lengths
+    cdef readonly dict hosts
+    cdef readonly list dynamic_hosts
+    cdef public dict interned
+    cdef public object index
 
     cdef public bint trim_last_slash
+    cdef public bint strict
+    cdef public bint normalize
     cdef public object validator
     cdef public object converter
+
+    cpdef object intern(self, object key, object factory=*)
+    cpdef object canonical(self, object path)
@@ -2,19 +2,32 @@ from __future__ import annotations
 
 from collections import defaultdict
 from functools import lru_cache, partial
+from itertools import chain
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
     ClassVar,
+    Iterable,
+    Iterator,
     Optional,
+    Union,
 )
 
 from .exceptions import InvalidMethodError, NotFoundError, RouterError
-from .utils import parse_path
+from .utils import (
+    freeze,
+    identity,
+    normalize_path,
+    normalize_template,
+    parse_host,
+    parse_path,
+    split_tail,
+    strip_port,
+)
 
 if TYPE_CHECKING:
-    from .types import TMethodsArg, TPath, TVObj
+    from .types import TMatchPath, TMethodsArg, TPath, TVObj
 
 
 class Router:
@@ -30,26 +43,47 @@ class Router:
         trim_last_slash: bool = False,
         validator: Optional[Callable[[Any], bool]] = None,
         converter: Optional[Callable] = None,
+        strict: bool = False,
+        normalize: bool = False,
     ):
         """Initialize the router.
 
         :param trim_last_slash: Ignore a last slash
         :param validator: Validate objects to route
         :param converter: Convert objects to route
+        :param strict: Reject shadowed and duplicated routes
+        :param normalize: Match paths by their canonical form (see ``RouteMatch.redirect``)
 
         """
         self.trim_last_slash = trim_last_slash
         self.validator = validator or (lambda _: True)
         self.converter = converter or (lambda v: v)
+        self.strict = strict
+        self.normalize = normalize
         self.plain: defaultdict[str, list[Route]] = defaultdict(list)
+        self.plain_raw: dict[bytes, list[Route]] = {}
         self.dynamic: list[Route] = []
-
-    def __call__(self, path: str, method: str = "GET") -> RouteMatch:
-        """Found a target for the given path and method."""
+        # Tail routes (prefix{name:path}) by their prefixes (both str and bytes)
+        self.tails: dict[Union[str, bytes], list[Route]] = {}
+        self.tail_lengths: list[int] = []
+        self.raw_tail_lengths: list[int] = []
+        self.hosts: dict[str, Router] = {}
+        self.dynamic_hosts: list[DynamicRoute] = []
+        self.interned: dict[Any, Any] = {}
+        # The dynamic routes index for the strict mode checks (it's built lazily)
+        self.index: Optional[RouteIndex] = None
+
+    def __call__(
+        self, path: TMatchPath, method: str = "GET", host: Optional[TMatchPath] = None,
+    ) -> RouteMatch:
+        """Found a target for the given path, method and host.
+
+        The path could be given as bytes (ASGI ``raw_path``) to skip its decoding.
+        """
         if self.trim_last_slash:
-            path = path.rstrip("/")
+            path = path.rstrip("/") if isinstance(path, str) else path.rstrip(b"/")
 
-        match = self.match(path, method)
+        match = self.match(path, method, host)
         if not match.path:
             raise self.NotFoundError(path, method)
 
@@ -69,10 +103,34 @@ class Router:
         return self
 
     @lru_cache(maxsize=1024)  # noqa: B019
-    def match(self, path: str, method: str) -> RouteMatch:
-        """Search a matched target for the given path and method."""
+    def match(
+        self, path: TMatchPath, method: str, host: Optional[TMatchPath] = None,
+    ) -> RouteMatch:
+        """Search a matched target for the given path, method and host.
+
+        Routes bound to the host have priority, the host-less routes are used as a fallback.
+        """
+        if self.normalize:
+            canonical = self.canonical(path)
+            if canonical != path:
+                match = self.match(canonical, method, host)
+                if not match.path:
+                    return match
+                return RouteMatch(
+                    match.path, match.method, match.target, match.params, redirect=canonical,
+                )
+
+        if host is not None and (self.hosts or self.dynamic_hosts):
+            return self.match_host(path, method, host)
+
         neighbour = None
-        for route in self.plain.get(path, self.dynamic):
+        routes: Optional[Iterable[Route]] = (
+            self.plain.get(path) if isinstance(path, str) else self.plain_raw.get(path)
+        )
+        if routes is None:
+            routes = chain(self.dynamic, self.tail_routes(path)) if self.tails else self.dynamic
+
+        for route in routes:
             match = route.match(path, method)
             if match.path:
                 if match.method:
@@ -81,6 +139,95 @@ class Router:
 
         return RouteMatch(path=False, method=False) if neighbour is None else neighbour
 
+    def canonical(self, path: TMatchPath) -> TMatchPath:
+        """Get the canonical form of the path (duplicate slashes and dot segments are removed)."""
+        if isinstance(path, str):
+            path = normalize_path(path)
+            return path.rstrip("/") if self.trim_last_slash else path
+
+        path = normalize_path(path)
+        return path.rstrip(b"/") if self.trim_last_slash else path
+
+    def tail_routes(self, path: TMatchPath) -> Iterator[Route]:
+        """Iterate the tail routes which prefixes match the path, the longest first."""
+        tails, size = self.tails, len(path)
+        for length in self.tail_lengths if isinstance(path, str) else self.raw_tail_lengths:
+            if length <= size:
+                routes = tails.get(path[:length])
+                if routes:
+                    yield from routes
+
+    def match_host(self, path: TMatchPath, method: str, host: TMatchPath) -> RouteMatch:
+        """Search a matched target in the routers bound to the given host.
+
+        The host port is ignored. The host-less routes are used as a fallback: a host route
+        which doesn't accept the method is returned only when they don't match either.
+        """
+        if isinstance(host, bytes):
+            host = host.decode("latin-1")
+
+        host = strip_port(host.lower())
+        neighbour = None
+        router = self.hosts.get(host)
+        if router is not None:
+            match = router.match(path, method)
+            if match.method:
+                return match
+            if match.path:
+                neighbour = match
+
+        for route in self.dynamic_hosts:
+            host_match = route.match(host, "")
+            if not host_match.path:
+                continue
+
+            match = route.target.match(path, method)
+            if match.path:
+                params = dict(host_match.params or {})
+                if match.params:
+                    params.update(match.params)
+                match = RouteMatch(match.path, match.method, match.target, params)
+                if match.method:
+                    return match
+                neighbour = match
+
+        match = self.match(path, method)
+        return match if match.method or neighbour is None else neighbour
+
+    def host_router(self, host: str) -> Router:
+        """Get (or create) a router which serves the given host.
+
+        The host could be exact (``example.com``) or parametrized (``{tenant}.example.com``).
+        """
+        path, pattern, params = parse_host(host)
+        if pattern is None:
+            router = self.hosts.get(path)
+            if router is None:
+                router = self.hosts[path] = self._spawn()
+            return router
+
+        for route in self.dynamic_hosts:
+            if route.path == path:
+                return route.target
+
+        router = self._spawn()
+        self.dynamic_hosts.append(
+            DynamicRoute(path, target=router, pattern=pattern, params=params),
+        )
+        return router
+
+    def _spawn(self) -> Router:
+        """Create an empty router with the same options (and interned route data)."""
+        router = self.__class__(
+            trim_last_slash=self.trim_last_slash,
+            validator=self.validator,
+            converter=self.converter,
+            strict=self.strict,
+            normalize=self.normalize,
+        )
+        router.interned = self.interned
+        return router
+
     def bind(
         self,
         target: Any,
@@ -96,42 +243,114 @@ class Router:
             methods = [methods]
 
         if methods is not None:
-            methods = {m.upper() for m in methods or []}
+            methods = self.intern(frozenset(m.upper() for m in methods))
 
         routes = []
 
         for src in paths:
             path = src
-            if self.trim_last_slash and isinstance(path, str):
-                path = path.rstrip("/")
+            if isinstance(path, str):
+                if self.normalize:
+                    path = normalize_template(path)
+                if self.trim_last_slash:
+                    path = path.rstrip("/")
 
             path, pattern, params = parse_path(path)
 
-            if pattern:
-                route: Route = DynamicRoute(
+            route: Route
+            if pattern and split_tail(path, pattern):
+                route = TailRoute(
+                    path,
+                    methods=methods,
+                    target=target,
+                    pattern=self.intern(pattern),
+                    params=self.intern(tuple(params.items()), freeze),
+                )
+
+            elif pattern:
+                route = DynamicRoute(
                     path,
                     methods=methods,
                     target=target,
-                    pattern=pattern,
-                    params=params,
+                    pattern=self.intern(pattern),
+                    params=self.intern(tuple(params.items()), freeze),
                 )
-                self.dynamic.append(route)
 
             else:
                 route = Route(path, methods, target)
-                self.plain[path].append(route)
 
             routes.append(route)
 
+        if self.strict:
+            # Check every path before adding any of them (and against each other)
+            batch = self._spawn()
+            for route in routes:
+                self.check(route)
+                batch.add(route)
+
+        for route in routes:
+            self.add(route)
+
         return routes
 
+    def check(self, route: Route):
+        """Raise an error if the route is shadowed or duplicated by the router's routes."""
+        for issue in check_route(self, route):
+            if issue.kind != AMBIGUOUS:
+                raise self.RouterError(
+                    "Route %s is %s by %s" % (route.path, issue.kind, issue.other.path),
+                )
+
+    def add(self, route: Route) -> Route:
+        """Add the route to the candidate lists."""
+        if self.strict:
+            self.check(route)
+
+        if isinstance(route, TailRoute):
+            tails = self.tails.setdefault(route.prefix, [])
+            tails.append(route)
+            share_raw(self.tails, route.raw, tails, route)
+            prefixes = self.tails.keys()
+            self.tail_lengths = sorted(
+                {len(p) for p in prefixes if isinstance(p, str)}, reverse=True,
+            )
+            self.raw_tail_lengths = sorted(
+                {len(p) for p in prefixes if isinstance(p, bytes)}, reverse=True,
+            )
+
+        elif isinstance(route, DynamicRoute):
+            self.dynamic.append(route)
+            if self.index is not None:
+                self.index.add(route, segments(route))
+
+        else:
+            routes = self.plain[route.path]
+            routes.append(route)
+            share_raw(self.plain_raw, route.raw, routes, route)
+
+        return route
+
+    def intern(self, key: Any, factory: Callable = identity) -> Any:
+        """Share equal (immutable) method sets, converter maps and patterns between routes."""
+        value = self.interned.get(key)
+        if value is None:
+            value = self.interned[key] = factory(key)
+        return value
+
     def route(
         self,
         *paths: TPath,
         methods: Optional[TMethodsArg] = None,
+        host: Optional[str] = None,
         **opts,
     ) -> Callable[[TVObj], TVObj]:
-        """Register a route."""
+        """Register a route.
+
+        :param host: Bind the route to the given host (``example.com``, ``{sub}.example.com``)
+
+        """
+        if host is not None:
+            return self.host_router(host).route(*paths, methods=methods, **opts)
 
         def wrapper(target: TVObj) -> TVObj:
             if hasattr(target, "__route__"):
@@ -147,11 +366,68 @@ class Router:
 
         return wrapper
 
+    def analyze(self) -> list[RouteIssue]:
+        """Find shadowed, duplicated and ambiguous routes (including the routes bound to hosts)."""
+        issues = analyze(self)
+        for router in self.host_routers():
+            issues.extend(router.analyze())
+        return issues
+
+    def prune(self) -> list[Route]:
+        """Drop unreachable (shadowed and duplicated) routes from the candidate lists (and hosts).
+
+        Only the requests with a wrong method could be affected: the router may report
+        another neighbour route for them.
+        """
+        pruned = {
+            id(issue.route): issue.route for issue in analyze(self) if issue.kind != AMBIGUOUS
+        }
+        if pruned:
+            self.dynamic[:] = [route for route in self.dynamic if id(route) not in pruned]
+            for routes in chain(self.plain.values(), self.plain_raw.values(), self.tails.values()):
+                routes[:] = [route for route in routes if id(route) not in pruned]
+            self.match.cache_clear()
+            self.index = None
+
+        return [
+            *pruned.values(),
+            *(route for router in self.host_routers() for route in router.prune()),
+        ]
+
+    def host_routers(self) -> list[Router]:
+        """Get the routers bound to hosts."""
+        return [*self.hosts.values(), *(route.target for route in self.dynamic_hosts)]
+
     def routes(self) -> list[Route]:
-        """Get a list of self routes."""
+        """Get a list of self routes (including the routes bound to hosts)."""
+        tails = [r for key, routes in self.tails.items() if isinstance(key, str) for r in routes]
+        hosts = self.host_routers()
         return sorted(
-            self.dynamic + [r for routes in self.plain.values() for r in routes],
+            self.dynamic
+            + [r for routes in self.plain.values() for r in routes]
+            + tails
+            + [r for router in hosts for r in router.routes()],
         )
 
 
-from .routes import DynamicRoute, Mount, Route, RouteMatch  # noqa: E402
+def share_raw(index: dict, raw: Any, routes: list[Route], route: Route):
+    """Share the routes list with the raw (percent-encoded) key.
+
+    Templates could have the same raw form (``/a b`` and ``/a%20b``), their routes are merged.
+    """
+    shared = index.get(raw)
+    if shared is None:
+        index[raw] = routes
+    elif shared is not routes:
+        index[raw] = [*shared, route]
+
+
+from .analysis import (  # noqa: E402
+    AMBIGUOUS,
+    RouteIndex,
+    RouteIssue,
+    analyze,
+    check_route,
+    segments,
+)
+from .routes import DynamicRoute, Mount, Route, RouteMatch, TailRoute  # noqa: E402
@@ -1,9 +1,12 @@
 from collections import defaultdict
 from functools import lru_cache, partial
-from typing import Any, Callable, ClassVar, DefaultDict, List, Optional, Type, Union
+from itertools import chain
+from typing import Any, Callable, ClassVar, DefaultDict, Dict, List, Optional, Type, Union
 
 from .types import TMethodsArg, TPath, TVObj
-from .utils import parse_path
+from .utils import (
+    freeze, identity, normalize_path, normalize_template, parse_host, parse_path, split_tail,
+    strip_port)
 from .exceptions import InvalidMethodError, NotFoundError, RouterError
 
 
@@ -18,21 +21,35 @@ cdef class Router:
             self,
             bint trim_last_slash=False,
             object validator=None,
-            object converter=None
+            object converter=None,
+            bint strict=False,
+            bint normalize=False
     ):
         """Initialize the router."""
         self.trim_last_slash = trim_last_slash
+        self.strict = strict
+        self.normalize = normalize
         self.validator = validator or (lambda v: True)
         self.converter = converter or (lambda v: v)
         self.plain: Dict[str, List[Route]] = {}
+        self.plain_raw: Dict[bytes, List[Route]] = {}
         self.dynamic: List[Route] = []
-
-    def __call__(self, str path, str method="GET") -> 'RouteMatch':
-        """Found a target for the given path and method."""
+        # Tail routes (prefix{name:path}) by their prefixes (both str and bytes)
+        self.tails: Dict[Union[str, bytes], List[Route]] = {}
+        self.tail_lengths: List[int] = []
+        self.raw_tail_lengths: List[int] = []
+        self.hosts: Dict[str, Router] = {}
+        self.dynamic_hosts: List[DynamicRoute] = []
+        self.interned: Dict[Any, Any] = {}
+        # The dynamic routes index for the strict mode checks (it's built lazily)
+        self.index = None
+
+    def __call__(self, object path, str method="GET", object host=None) -> 'RouteMatch':
+        """Found a target for the given path, method and host."""
         if self.trim_last_slash:
-            path = path.rstrip('/')
+            path = path.rstrip('/' if isinstance(path, str) else b'/')
 
-        match = self.match(path, method)
+        match = self.match(path, method, host)
 
         if match is None:
             raise self.NotFoundError(path, method)
@@ -50,12 +67,27 @@ cdef class Router:
         return self
 
     @lru_cache(maxsize=1024)
-    def match(self, str path, str method) -> 'RouteMatch':
-        """Search a matched target for the given path and method."""
-        cdef list routes = self.plain.get(path, self.dynamic)
+    def match(self, object path, str method, object host=None) -> 'RouteMatch':
+        """Search a matched target for the given path, method and host."""
         cdef RouteMatch match, neighbor = None
         cdef Route route
 
+        if self.normalize:
+            canonical = self.canonical(path)
+            if canonical != path:
+                match = self.match(canonical, method, host)
+                if match is None:
+                    return match
+                return RouteMatch(
+                    match.path, match.method, match.target, match.params, redirect=canonical)
+
+        if host is not None and (self.hosts or self.dynamic_hosts):
+            return self.match_host(path, method, host)
+
+        routes = (self.plain if isinstance(path, str) else self.plain_raw).get(path)
+        if routes is None:
+            routes = chain(self.dynamic, self.tail_routes(path)) if self.tails else self.dynamic
+
         for route in routes:
             match = route.match(path, method)
             if match.path:
@@ -65,8 +97,96 @@ cdef class Router:
 
         return neighbor
 
+    cpdef object canonical(self, object path):
+        """Get the canonical form of the path (duplicate slashes and dot segments are removed)."""
+        path = normalize_path(path)
+        if self.trim_last_slash:
+            return path.rstrip('/' if isinstance(path, str) else b'/')
+        return path
+
+    def tail_routes(self, object path):
+        """Iterate the tail routes which prefixes match the path, the longest first."""
+        cdef dict tails = self.tails
+        cdef Py_ssize_t length, size = len(path)
+        for length in self.tail_lengths if isinstance(path, str) else self.raw_tail_lengths:
+            if length <= size:
+                routes = tails.get(path[:length])
+                if routes:
+                    yield from routes
+
+    def match_host(self, object path, str method, object host) -> 'RouteMatch':
+        """Search a matched target in the routers bound to the given host."""
+        cdef RouteMatch match, host_match, neighbor = None
+        cdef DynamicRoute route
+        cdef Router router
+        cdef dict params
+
+        if isinstance(host, bytes):
+            host = host.decode('latin-1')
+
+        host = strip_port(host.lower())
+        router = self.hosts.get(host)
+        if router is not None:
+            match = router.match(path, method)
+            if match is not None:
+                if match.method:
+                    return match
+                neighbor = match
+
+        for route in self.dynamic_hosts:
+            host_match = route.match(host, "")
+            if not host_match.path:
+                continue
+
+            match = route.target.match(path, method)
+            if match is not None:
+                params = dict(host_match.params or {})
+                if match.params:
+                    params.update(match.params)
+                match = RouteMatch(match.path, match.method, match.target, params)
+                if match.method:
+                    return match
+                neighbor = match
+
+        match = self.match(path, method)
+        if match is not None and (match.method or neighbor is None):
+            return match
+        return neighbor
+
+    def host_router(self, str host) -> 'Router':
+        """Get (or create) a router which serves the given host."""
+        path, pattern, params = parse_host(host)
+        if pattern is None:
+            router = self.hosts.get(path)
+            if router is None:
+                router = self.hosts[path] = self._spawn()
+            return router
+
+        for route in self.dynamic_hosts:
+            if route.path == path:
+                return route.target
+
+        router = self._spawn()
+        self.dynamic_hosts.append(
+            DynamicRoute(path, None, target=router, pattern=pattern, params=params))
+        return router
+
+    def _spawn(self) -> 'Router':
+        """Create an empty router with the same options."""
+        cdef Router router = self.__class__(
+            trim_last_slash=self.trim_last_slash,
+            validator=self.validator,
+            converter=self.converter,
+            strict=self.strict,
+            normalize=self.normalize,
+        )
+        router.interned = self.interned
+        return router
+
     def bind(self, target: Any, *paths: TPath, methods: Optional[TMethodsArg] = None, **opts):
         """Bind a target to self."""
+        cdef Route route
+
         if opts:
             target = partial(target, **opts)
 
@@ -74,36 +194,95 @@ cdef class Router:
             methods = [methods]
 
         if methods:
-            methods = set(m.upper() for m in methods or [])
+            methods = self.intern(frozenset(m.upper() for m in methods))
 
         routes = []
         for path in paths:
-            if self.trim_last_slash and isinstance(path, str):
-                path = path.rstrip('/')
+            if isinstance(path, str):
+                if self.normalize:
+                    path = normalize_template(path)
+                if self.trim_last_slash:
+                    path = path.rstrip('/')
 
             path, pattern, params = parse_path(path)
 
-            if pattern:
-                route: Route = DynamicRoute(
-                    path, methods=methods, target=target, pattern=pattern, params=params)
-                self.dynamic.append(route)
+            if pattern and split_tail(path, pattern):
+                route = TailRoute(
+                    path, methods=methods, target=target, pattern=self.intern(pattern),
+                    params=self.intern(tuple(params.items()), freeze))
+
+            elif pattern:
+                route = DynamicRoute(
+                    path, methods=methods, target=target, pattern=self.intern(pattern),
+                    params=self.intern(tuple(params.items()), freeze))
 
             else:
                 route = Route(path, methods, target)
-                self.plain.setdefault(path, [])
-                self.plain[path].append(route)
 
             routes.append(route)
 
+        if self.strict:
+            # Check every path before adding any of them (and against each other)
+            batch = self._spawn()
+            for route in routes:
+                self.check(route)
+                batch.add(route)
+
+        for route in routes:
+            self.add(route)
+
         return routes
 
+    def check(self, object route):
+        """Raise an error if the route is shadowed or duplicated by the router's routes."""
+        for issue in check_route(self, route):
+            if issue.kind != AMBIGUOUS:
+                raise self.RouterError(
+                    'Route %s is %s by %s' % (route.path, issue.kind, issue.other.path))
+
+    def add(self, object route) -> 'Route':
+        """Add the route to the candidate lists."""
+        if self.strict:
+            self.check(route)
+
+        if isinstance(route, TailRoute):
+            self.tails.setdefault(route.prefix, [])
+            self.tails[route.prefix].append(route)
+            share_raw(self.tails, route.raw, self.tails[route.prefix], route)
+            self.tail_lengths = sorted(
+                set(len(p) for p in self.tails if isinstance(p, str)), reverse=True)
+            self.raw_tail_lengths = sorted(
+                set(len(p) for p in self.tails if isinstance(p, bytes)), reverse=True)
+
+        elif isinstance(route, DynamicRoute):
+            self.dynamic.append(route)
+            if self.index is not None:
+                self.index.add(route, segments(route))
+
+        else:
+            self.plain.setdefault(route.path, [])
+            self.plain[route.path].append(route)
+            share_raw(self.plain_raw, route.raw, self.plain[route.path], route)
+
+        return route
+
+    cpdef object intern(self, object key, object factory=identity):
+        """Share equal (immutable) method sets, converter maps and patterns between routes."""
+        value = self.interned.get(key)
+        if value is None:
+            value = self.interned[key] = factory(key)
+        return value
+
     def route(
         self,
         *paths: TPath,
         methods: Optional[TMethodsArg] = None,
+        str host = None,
         **opts
     ):
         """Register a route."""
+        if host is not None:
+            return self.host_router(host).route(*paths, methods=methods, **opts)
 
         def wrapper(target: TVObj) -> TVObj:
             if hasattr(target, '__route__'):
@@ -119,15 +298,58 @@ cdef class Router:
 
         return wrapper
 
+    def analyze(self) -> List['RouteIssue']:
+        """Find shadowed, duplicated and ambiguous routes (including the routes bound to hosts)."""
+        issues = analyze(self)
+        for router in self.host_routers():
+            issues.extend(router.analyze())
+        return issues
+
+    def prune(self) -> List['Route']:
+        """Drop unreachable (shadowed and duplicated) routes from the candidate lists (and hosts).
+
+        Only the requests with a wrong method could be affected: the router may report
+        another neighbour route for them.
+        """
+        pruned = {
+            id(issue.route): issue.route for issue in analyze(self) if issue.kind != AMBIGUOUS}
+        if pruned:
+            self.dynamic[:] = [route for route in self.dynamic if id(route) not in pruned]
+            for routes in chain(self.plain.values(), self.plain_raw.values(), self.tails.values()):
+                routes[:] = [route for route in routes if id(route) not in pruned]
+            self.match.cache_clear()
+            self.index = None
+
+        return list(pruned.values()) + [
+            route for router in self.host_routers() for route in router.prune()]
+
+    def host_routers(self) -> List['Router']:
+        """Get the routers bound to hosts."""
+        return list(self.hosts.values()) + [route.target for route in self.dynamic_hosts]
+
     def routes(self) -> List['Route']:
-        """Get a list of self routes."""
-        return sorted(self.dynamic + [r for routes in self.plain.values() for r in routes])
+        """Get a list of self routes (including the routes bound to hosts)."""
+        tails = [r for key, routes in self.tails.items() if isinstance(key, str) for r in routes]
+        hosts = self.host_routers()
+        return sorted(
+            self.dynamic + [r for routes in self.plain.values() for r in routes] + tails +
+            [r for router in hosts for r in router.routes()])
 
     def __getattr__(self, method: str) -> Callable:
         """Shortcut to the router methods."""
         return partial(self.route, methods=method)
 
 
-from .routes cimport DynamicRoute, Mount, Route, RouteMatch  # noqa
+def share_raw(dict index, bytes raw, list routes, route):
+    """Share the routes list with the raw (percent-encoded) key."""
+    shared = index.get(raw)
+    if shared is None:
+        index[raw] = routes
+    elif shared is not routes:
+        index[raw] = shared + [route]
+
+
+from .analysis import AMBIGUOUS, analyze, check_route, segments  # noqa
+from .routes cimport DynamicRoute, Mount, Route, RouteMatch, TailRoute  # noqa
 
 # pylama: ignore=D
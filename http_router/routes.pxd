@@ -8,21 +8,30 @@ cdef class RouteMatch:
     cdef readonly bint path, method
     cdef readonly object target
     cdef readonly dict params
+    cdef readonly object redirect
 
 
 cdef class Route:
 
     cdef readonly str path
-    cdef readonly set methods
+    cdef readonly object methods
     cdef readonly object target
+    cdef readonly bytes raw
 
-    cpdef RouteMatch match(self, str path, str method)
+    cpdef RouteMatch match(self, object path, str method)
 
 
 cdef class DynamicRoute(Route):
 
     cdef readonly object pattern
-    cdef readonly dict params
+    cdef readonly object params
+    cdef readonly object raw_pattern
+
+
+cdef class TailRoute(DynamicRoute):
+
+    cdef readonly str prefix
+    cdef readonly str name
 
 
 cdef class PrefixedRoute(Route):
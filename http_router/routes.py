@@ -1,19 +1,35 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Callable, Mapping, Optional, Pattern, cast
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Mapping,
+    Match,
+    Optional,
+    Pattern,
+    cast,
+)
 from urllib.parse import unquote
 
 from .router import Router
-from .utils import identity, parse_path
+from .utils import (
+    compile_raw,
+    identity,
+    parse_path,
+    quote_raw,
+    split_tail,
+    unquote_raw,
+)
 
 if TYPE_CHECKING:
-    from .types import TMethods
+    from .types import TMatchPath, TMethods
 
 
 class RouteMatch:
     """Keeping route matching data."""
 
-    __slots__ = "path", "method", "target", "params"
+    __slots__ = "path", "method", "target", "params", "redirect"
 
     def __init__(
         self,
@@ -21,11 +37,13 @@ class RouteMatch:
         method: bool,
         target=None,
         params: Optional[Mapping[str, Any]] = None,
+        redirect: Optional[TMatchPath] = None,
     ):
         self.path = path
         self.method = method
         self.target = target
         self.params = params
+        self.redirect = redirect
 
     def __bool__(self):
         return self.path and self.method
@@ -37,7 +55,7 @@ class RouteMatch:
 class Route:
     """Base plain route class."""
 
-    __slots__ = "path", "methods", "target"
+    __slots__ = "path", "methods", "target", "raw"
 
     def __init__(
         self, path: str, methods: Optional[TMethods] = None, target: Any = None,
@@ -45,23 +63,26 @@ class Route:
         self.path = path
         self.methods = methods
         self.target = target
+        self.raw = quote_raw(path)
 
     def __lt__(self, route: "Route") -> bool:
         assert isinstance(route, Route), "Only routes are supported"
         return self.path < route.path
 
-    def match(self, path: str, method: str) -> RouteMatch:
+    def match(self, path: TMatchPath, method: str) -> RouteMatch:
         """Is the route match the path."""
         methods = self.methods
         return RouteMatch(
-            path == self.path, methods is None or (method in methods), self.target,
+            path == (self.path if isinstance(path, str) else self.raw),
+            methods is None or (method in methods),
+            self.target,
         )
 
 
 class DynamicRoute(Route):
     """Base dynamic route class."""
 
-    __slots__ = "path", "methods", "target", "pattern", "params"
+    __slots__ = "pattern", "params", "raw_pattern"
 
     def __init__(
         self,
@@ -69,17 +90,35 @@ class DynamicRoute(Route):
         methods: Optional[TMethods] = None,
         target: Any = None,
         pattern: Optional[Pattern] = None,
-        params: Optional[dict] = None,
+        params: Optional[Mapping[str, Callable]] = None,
     ):
         if pattern is None:
             path, pattern, params = parse_path(path)
             assert pattern, "Invalid path"
+        self.path = path
+        self.methods = methods
+        self.target = target
         self.pattern = pattern
         self.params = params or {}
-        super(DynamicRoute, self).__init__(path, methods, target)
+        # Dynamic routes don't need the raw path, they lazily compile a raw pattern
+        self.raw = b""
+        self.raw_pattern: Optional[Pattern[bytes]] = None
+
+    def match(self, path: TMatchPath, method: str) -> RouteMatch:
+        match: Optional[Match]
+        if isinstance(path, str):
+            match = self.pattern.match(path)
+            decode: Callable = unquote
+
+        else:
+            # Raw paths are matched with a lazily compiled bytes pattern,
+            # only the captured values are decoded
+            pattern = self.raw_pattern
+            if pattern is None:
+                pattern = self.raw_pattern = compile_raw(self.pattern, template=bool(self.params))
+            match = pattern.match(path)
+            decode = unquote_raw
 
-    def match(self, path: str, method: str) -> RouteMatch:
-        match = self.pattern.match(path)
         if not match:
             return RouteMatch(False, False)
 
@@ -88,15 +127,56 @@ class DynamicRoute(Route):
             not self.methods or method in self.methods,
             self.target,
             {
-                key: self.params.get(key, identity)(unquote(value))
+                key: self.params.get(key, identity)(decode(value))
                 for key, value in match.groupdict().items()
             },
         )
 
 
+class TailRoute(DynamicRoute):
+    """Match a prefix and capture the rest of the path (``/static/{file:path}``)."""
+
+    __slots__ = "name", "prefix"
+
+    def __init__(
+        self,
+        path: str,
+        methods: Optional[TMethods] = None,
+        target: Any = None,
+        pattern: Optional[Pattern] = None,
+        params: Optional[Mapping[str, Callable]] = None,
+    ):
+        super(TailRoute, self).__init__(path, methods, target, pattern, params)
+        tail = split_tail(self.path, self.pattern)
+        assert tail, "Invalid tail path"
+        self.prefix, self.name = tail
+        self.raw = quote_raw(self.prefix)
+
+    def match(self, path: TMatchPath, method: str) -> RouteMatch:
+        """Check the prefix and capture the rest of the path by slicing."""
+        if isinstance(path, str):
+            if not path.startswith(self.prefix):
+                return RouteMatch(False, False)
+            value = unquote(path[len(self.prefix) :])
+
+        else:
+            if not path.startswith(self.raw):
+                return RouteMatch(False, False)
+            value = unquote_raw(path[len(self.raw) :])
+
+        return RouteMatch(
+            True,
+            not self.methods or method in self.methods,
+            self.target,
+            {self.name: self.params.get(self.name, identity)(value)},
+        )
+
+
 class PrefixedRoute(Route):
     """Match by a prefix."""
 
+    __slots__ = ()
+
     def __init__(
         self, path: str, methods: Optional[TMethods] = None, target: Any = None,
     ):
@@ -106,17 +186,23 @@ class PrefixedRoute(Route):
 
         super(PrefixedRoute, self).__init__(path.rstrip("/"), methods, target)
 
-    def match(self, path: str, method: str) -> RouteMatch:
+    def match(self, path: TMatchPath, method: str) -> RouteMatch:
         """Is the route match the path."""
         methods = self.methods
         return RouteMatch(
-            path.startswith(self.path), not methods or (method in methods), self.target,
+            path.startswith(self.path)
+            if isinstance(path, str)
+            else path.startswith(self.raw),
+            not methods or (method in methods),
+            self.target,
         )
 
 
 class Mount(PrefixedRoute):
     """Support for nested routers."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         path: str,
@@ -127,12 +213,13 @@ class Mount(PrefixedRoute):
         router = router or Router()
         super(Mount, self).__init__(path, methods, router.match)
 
-    def match(self, path: str, method: str) -> RouteMatch:
+    def match(self, path: TMatchPath, method: str) -> RouteMatch:
         """Is the route match the path."""
         match: RouteMatch = super(Mount, self).match(path, method)
         if match:
             target = cast(Callable, self.target)
-            return target(path[len(self.path) :], method)
+            prefix = self.path if isinstance(path, str) else self.raw
+            return target(path[len(prefix) :], method)
 
         return match
 
@@ -2,17 +2,19 @@ from typing import Pattern, Union
 from urllib.parse import unquote
 
 from .router import Router
-from .utils import parse_path, identity
+from .utils import compile_raw, parse_path, identity, quote_raw, split_tail, unquote_raw
 
 
 cdef class RouteMatch:
     """Keeping route matching data."""
 
-    def __cinit__(self, bint path, bint method, object target=None, dict params=None):
+    def __cinit__(self, bint path, bint method, object target=None, dict params=None,
+                  object redirect=None):
         self.path = path
         self.method = method
         self.target = target
         self.params = params
+        self.redirect = redirect
 
     def __bool__(self) -> bool:
         return self.path and self.method
@@ -21,20 +23,21 @@ cdef class RouteMatch:
 cdef class Route:
     """Base plain route class."""
 
-    def __init__(self, str path, set methods, object target=None):
+    def __init__(self, str path, object methods, object target=None):
         self.path = path
         self.methods = methods
         self.target = target
+        self.raw = quote_raw(path)
 
     def __lt__(self, Route route) -> bool:
         return self.path < route.path
 
-    cpdef RouteMatch match(self, str path, str method):
+    cpdef RouteMatch match(self, object path, str method):
         """Is the route match the path."""
-        cdef bint path_ = self.path == path
-        cdef set methods = self.methods
+        cdef bint path_ = (self.path if isinstance(path, str) else self.raw) == path
+        cdef object methods = self.methods
         cdef bint method_ = not methods or method in methods
-        if not (path_ and method_):
+        if not path_:
             return RouteMatch(path_, method_)
 
         return RouteMatch(path_, method_, self.target)
@@ -43,8 +46,8 @@ cdef class Route:
 cdef class DynamicRoute(Route):
     """Base dynamic route class."""
 
-    def __init__(self, path: Union[str, Pattern], set methods,
-                 object target=None, pattern: Pattern = None, dict params = None):
+    def __init__(self, path: Union[str, Pattern], object methods,
+                 object target=None, pattern: Pattern = None, object params = None):
 
         if pattern is None:
             path, pattern, params = parse_path(path)
@@ -52,53 +55,96 @@ cdef class DynamicRoute(Route):
 
         self.pattern = pattern
         self.params = params
+        self.raw_pattern = None
         self.path = path
         self.methods = methods
         self.target = target
+        # Dynamic routes don't need the raw path, they lazily compile a raw pattern
+        self.raw = b""
+
+    cpdef RouteMatch match(self, object path, str method):
+        cdef object decode = unquote
+        if isinstance(path, str):
+            match = self.pattern.match(path)  # type: ignore  # checked in __post_init__
+
+        else:
+            if self.raw_pattern is None:
+                self.raw_pattern = compile_raw(self.pattern, template=bool(self.params))
+            match = self.raw_pattern.match(path)
+            decode = unquote_raw
 
-    cpdef RouteMatch match(self, str path, str method):
-        match = self.pattern.match(path)  # type: ignore  # checked in __post_init__
         if not match:
             return RouteMatch(False, False)
 
         cdef bint method_ = not self.methods or method in self.methods
         cdef dict path_params = {
-            key: self.params.get(key, identity)(unquote(value))
+            key: self.params.get(key, identity)(decode(value))
             for key, value in match.groupdict().items()
         }
 
         return RouteMatch(True, method_, self.target, path_params)
 
 
+cdef class TailRoute(DynamicRoute):
+    """Match a prefix and capture the rest of the path (``/static/{file:path}``)."""
+
+    def __init__(self, path: Union[str, Pattern], object methods,
+                 object target=None, pattern: Pattern = None, object params = None):
+        super(TailRoute, self).__init__(path, methods, target, pattern, params)
+        tail = split_tail(self.path, self.pattern)
+        assert tail, 'Invalid tail path'
+        self.prefix, self.name = tail
+        self.raw = quote_raw(self.prefix)
+
+    cpdef RouteMatch match(self, object path, str method):
+        """Check the prefix and capture the rest of the path by slicing."""
+        if isinstance(path, str):
+            if not path.startswith(self.prefix):
+                return RouteMatch(False, False)
+            value = unquote(path[len(self.prefix):])
+
+        else:
+            if not path.startswith(self.raw):
+                return RouteMatch(False, False)
+            value = unquote_raw(path[len(self.raw):])
+
+        cdef bint method_ = not self.methods or method in self.methods
+        return RouteMatch(
+            True, method_, self.target,
+            {self.name: self.params.get(self.name, identity)(value)})
+
+
 cdef class PrefixedRoute(Route):
     """Match by a prefix."""
 
-    def __init__(self, str path, set methods, object target=None):
+    def __init__(self, str path, object methods, object target=None):
         path, pattern, _ = parse_path(path)
         if pattern:
             assert not pattern, "Prefix doesn't support patterns."
 
         super(PrefixedRoute, self).__init__(path.rstrip('/'), methods, target)
 
-    cpdef RouteMatch match(self, str path, str method):
+    cpdef RouteMatch match(self, object path, str method):
         """Is the route match the path."""
-        cdef set methods = self.methods
+        cdef object methods = self.methods
         return RouteMatch(
-            path.startswith(self.path), not methods or (method in methods), self.target)
+            path.startswith(self.path if isinstance(path, str) else self.raw),
+            not methods or (method in methods), self.target)
 
 
 cdef class Mount(PrefixedRoute):
     """Support for nested routers."""
 
-    def __init__(self, str path, set methods, Router router=None):
+    def __init__(self, str path, object methods, Router router=None):
         """Validate self prefix."""
         router = router or Router()
         super(Mount, self).__init__(path, methods, router.match)
 
-    cpdef RouteMatch match(self, str path, str method):
+    cpdef RouteMatch match(self, object path, str method):
         """Is the route match the path."""
         cdef RouteMatch match = super(Mount, self).match(path, method)
         if match.path and match.method:
-            return self.target(path[len(self.path):], method)
+            prefix = self.path if isinstance(path, str) else self.raw
+            return self.target(path[len(prefix):], method)
 
         return match
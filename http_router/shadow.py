@@ -0,0 +1,129 @@
+"""Run a candidate matching engine alongside the router on sampled requests."""
+
+from __future__ import annotations
+
+import logging
+from functools import partial
+from random import random
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+if TYPE_CHECKING:
+    from .router import Router
+    from .routes import RouteMatch
+    from .types import TMatchPath
+
+logger = logging.getLogger("http_router")
+
+
+def compare(expected: Optional[RouteMatch], result: Optional[RouteMatch]) -> Optional[str]:
+    """Describe the difference between two matches (None when they are equal).
+
+    Engines may return None for missing paths, it's the same as a 404 match.
+    """
+    status = (bool(expected and expected.path), bool(expected and expected.method))
+    other = (bool(result and result.path), bool(result and result.method))
+    if status != other:
+        return f"status {status} != {other}"
+
+    if expected is None or result is None or not expected.path:
+        return None
+
+    if expected.target != result.target:
+        return f"target {expected.target!r} != {result.target!r}"
+
+    if (expected.params or {}) != (result.params or {}):
+        return f"params {expected.params!r} != {result.params!r}"
+
+    if expected.redirect != result.redirect:
+        return f"redirect {expected.redirect!r} != {result.redirect!r}"
+
+    return None
+
+
+class Shadow:
+    """Dispatch requests with the router and verify a sample with a candidate engine.
+
+    The router's results are always returned, mismatches are logged.
+    """
+
+    def __init__(
+        self,
+        router: Router,
+        candidate: Callable[..., Any],
+        *,
+        rate: float = 0.01,
+        logger: logging.Logger = logger,
+    ):
+        """Initialize the shadow mode.
+
+        :param router: The primary router
+        :param candidate: A match function to verify (``compile_router(router)``)
+        :param rate: A share of requests to verify (0..1)
+        :param logger: A logger for mismatches
+
+        """
+        self.router = router
+        self.candidate = candidate
+        # The candidate has no cache, so the router is timed without its one
+        match = type(router).match
+        self.uncached = (
+            partial(match.__wrapped__, router) if hasattr(match, "__wrapped__") else router.match
+        )
+        self.rate = rate
+        self.logger = logger
+        self.sampled = self.mismatches = 0
+        self.timings = {"primary": 0.0, "candidate": 0.0}
+
+    def __call__(
+        self, path: TMatchPath, method: str = "GET", host: Optional[TMatchPath] = None,
+    ) -> RouteMatch:
+        """Found a target for the given path, method and host (see ``Router.__call__``)."""
+        router = self.router
+        if router.trim_last_slash:
+            path = path.rstrip("/") if isinstance(path, str) else path.rstrip(b"/")
+
+        match = self.match(path, method, host)
+        if match is None or not match.path:
+            raise router.NotFoundError(path, method)
+
+        if not match.method:
+            raise router.InvalidMethodError(path, method)
+
+        return match
+
+    def match(
+        self, path: TMatchPath, method: str, host: Optional[TMatchPath] = None,
+    ) -> RouteMatch:
+        """Match with the router, compare the candidate results on sampled requests."""
+        if random() >= self.rate:  # noqa: S311
+            return self.router.match(path, method, host)
+
+        start = perf_counter()
+        expected = self.uncached(path, method, host)
+        middle = perf_counter()
+        # The candidate's errors never reach the caller
+        error = result = None
+        try:
+            result = self.candidate(path, method, host)
+        except Exception as exc:  # noqa: BLE001
+            error = exc
+        end = perf_counter()
+
+        self.sampled += 1
+        self.timings["primary"] += middle - start
+        self.timings["candidate"] += end - middle
+
+        diff = f"candidate raised {error!r}" if error else compare(expected, result)
+        if diff:
+            self.mismatches += 1
+            self.logger.warning(
+                "Engines mismatch: %s %r (host %r): %s", method, path, host, diff, exc_info=error,
+            )
+
+        return expected
+
+    def latency(self) -> dict[str, float]:
+        """Get the mean latency of the engines on the sampled requests (seconds)."""
+        sampled = self.sampled or 1
+        return {name: total / sampled for name, total in self.timings.items()}
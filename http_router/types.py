@@ -5,4 +5,5 @@ from typing import Any, Iterable, Pattern, TypeVar, Union
 TMethods = Iterable[str]
 TMethodsArg = Union[TMethods, str]
 TPath = Union[str, Pattern]
+TMatchPath = Union[str, bytes]
 TVObj = TypeVar("TVObj", bound=Any)
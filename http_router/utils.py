@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import re
-from typing import TYPE_CHECKING, Optional, Pattern
+from types import MappingProxyType
+from typing import TYPE_CHECKING, AnyStr, Optional, Pattern
+from urllib.parse import quote, unquote_to_bytes
 from uuid import UUID
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterable, Mapping
 
     from .types import TPath, TVObj
 
@@ -14,6 +16,15 @@ def identity(v: TVObj) -> TVObj:
     return v
 
 
+def freeze(items: Iterable[tuple[str, Callable]]) -> Mapping[str, Callable]:
+    """Build a read-only params mapping (it's shared between routes)."""
+    return MappingProxyType(dict(items))
+
+
+PERCENT_RE = re.compile(r"%[0-9a-fA-F]{2}")
+# Template variables (regexps could have braces as well)
+TEMPLATE_VAR_RE = re.compile(r"\{(?:[^{}]|\{[^{}]*\})*\}")
+HIDDEN_VAR_RE = re.compile(r"\0(\d+)\0")
 VAR_RE = re.compile(r"^(?P<var>[a-zA-Z][_a-zA-Z0-9]*)(?::(?P<var_type>.+))?$")
 VAR_TYPES = {
     "float": (r"\d+(\.\d+)?", float),
@@ -22,9 +33,12 @@ VAR_TYPES = {
     "str": (r"[^/]+", str),
     "uuid": (r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", UUID),
 }
+HOST_VAR_TYPES = {**VAR_TYPES, "str": (r"[^.]+", str)}
 
 
-def parse_path(path: TPath) -> tuple[str, Optional[Pattern], dict[str, Callable]]:
+def parse_path(
+    path: TPath, var_types: Mapping[str, tuple[str, Callable]] = VAR_TYPES,
+) -> tuple[str, Optional[Pattern], dict[str, Callable]]:
     """Prepare the given path to regexp it."""
     if isinstance(path, Pattern):
         return path.pattern, path, {}
@@ -50,7 +64,7 @@ def parse_path(path: TPath) -> tuple[str, Optional[Pattern], dict[str, Callable]
             match = VAR_RE.match(part.strip())
             if match:
                 opts = match.groupdict("str")
-                var_type_re, params[opts["var"]] = VAR_TYPES.get(
+                var_type_re, params[opts["var"]] = var_types.get(
                     opts["var_type"], (opts["var_type"], identity),
                 )
                 regex += (
@@ -68,3 +82,154 @@ def parse_path(path: TPath) -> tuple[str, Optional[Pattern], dict[str, Callable]
     regex += re.escape(src[idx:]) + "$"
     path += src[idx:]
     return path, re.compile(regex), params
+
+
+def split_tail(path: str, pattern: Pattern) -> Optional[tuple[str, str]]:
+    """Split a parsed ``prefix{name:path}`` template into the prefix and the name.
+
+    Return None when the template is not a plain prefix followed by a path variable.
+    """
+    if not path.endswith("}"):
+        return None
+
+    idx = path.rfind("{")
+    prefix, name = path[:idx], path[idx + 1 : -1]
+    if pattern.pattern != f"^{re.escape(prefix)}(?P<{name}>{VAR_TYPES['path'][0]})$":
+        return None
+
+    return prefix, name
+
+
+def normalize_path(path: AnyStr) -> AnyStr:
+    """Get a canonical form of the path in one pass.
+
+    Duplicate slashes and dot segments are removed, percent escapes are uppercased.
+    """
+    if isinstance(path, bytes):
+        return normalize_path(path.decode("latin-1")).encode("latin-1")
+
+    if "//" not in path and "/." not in path and "%" not in path:
+        return path
+
+    parts = path.split("/")
+    result: list[str] = []
+    for part in parts:
+        if not part or part == ".":
+            continue
+
+        if part == "..":
+            if result:
+                result.pop()
+            continue
+
+        if "%" in part:
+            part = PERCENT_RE.sub(lambda m: m.group(0).upper(), part)  # noqa: PLW2901
+
+        result.append(part)
+
+    lead = "/" if path.startswith("/") else ""
+    trail = "/" if result and parts[-1] in ("", ".", "..") else ""
+    return lead + "/".join(result) + trail
+
+
+def strip_port(host: str) -> str:
+    """Drop the port from the host (``example.com:8000``, ``[::1]:8000``)."""
+    head, sep, port = host.rpartition(":")
+    if sep and (not port or port.isdecimal()) and (head.endswith("]") or ":" not in head):
+        return head
+    return host
+
+
+def normalize_template(path: str) -> str:
+    """Get a canonical form of the route template, the variables are kept as is."""
+    variables: list[str] = []
+
+    def hide(match: re.Match) -> str:
+        variables.append(match.group(0))
+        return f"\0{len(variables) - 1}\0"
+
+    path = normalize_path(TEMPLATE_VAR_RE.sub(hide, path))
+    return HIDDEN_VAR_RE.sub(lambda m: variables[int(m.group(1))], path)
+
+
+def parse_host(host: str) -> tuple[str, Optional[Pattern], dict[str, Callable]]:
+    """Prepare the given host to regexp it (variables don't cross dots by default).
+
+    Hosts are case-insensitive: the literals are lowercased, the variables are kept as is.
+    """
+    parts, idx = [], 0
+    for match in TEMPLATE_VAR_RE.finditer(host):
+        parts += [host[idx : match.start()].lower(), match.group(0)]
+        idx = match.end()
+    parts.append(host[idx:].lower())
+    return parse_path("".join(parts), HOST_VAR_TYPES)
+
+
+def compile_raw(pattern: Pattern, *, template: bool = False) -> Pattern[bytes]:
+    """Compile a bytes version of the given pattern to match raw (undecoded) paths.
+
+    :param template: The pattern is built by ``parse_path``, its literals are percent-encoded
+
+    """
+    source = quote_literals(pattern.pattern) if template else pattern.pattern
+    return re.compile(source.encode(), pattern.flags & ~re.UNICODE)
+
+
+def quote_literals(regex: str) -> str:
+    """Percent-encode the literals of a template regexp, the variables groups are kept.
+
+    Out of the groups ``parse_path`` puts only escaped literals (between ``^`` and ``$``).
+    """
+    body, result, literal, idx = regex[1:-1], ["^"], "", 0
+    while idx < len(body):
+        if body[idx] == "(":
+            if literal:
+                result.append(re.escape(quote_raw(literal).decode()))
+                literal = ""
+            end = group_end(body, idx)
+            result.append(body[idx:end])
+            idx = end
+            continue
+
+        if body[idx] == "\\":
+            idx += 1
+        literal += body[idx]
+        idx += 1
+
+    if literal:
+        result.append(re.escape(quote_raw(literal).decode()))
+
+    result.append("$")
+    return "".join(result)
+
+
+def group_end(regex: str, idx: int) -> int:
+    """Find the end of the regexp group which starts at the index."""
+    depth, klass = 0, False
+    while idx < len(regex):
+        sym = regex[idx]
+        idx += 1
+        if sym == "\\":
+            idx += 1
+        elif klass:
+            klass = sym != "]"
+        elif sym == "[":
+            klass = True
+        elif sym == "(":
+            depth += 1
+        elif sym == ")":
+            depth -= 1
+            if not depth:
+                break
+
+    return idx
+
+
+def quote_raw(path: str) -> bytes:
+    """Percent-encode a path the way clients send it (the existing escapes are kept)."""
+    return quote(path, safe="/:@!$&'()*+,;=%").encode()
+
+
+def unquote_raw(value: bytes) -> str:
+    """Percent-decode a value captured from a raw path."""
+    return unquote_to_bytes(value).decode("utf-8", "replace")
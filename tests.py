@@ -166,6 +166,15 @@ def test_router():
     router.route("/only-post", methods="post")("only-post")
     assert router.plain["/only-post"][0].methods == {"POST"}
 
+    # Equal methods and params are interned (shared between routes)
+    first, second = router.bind("shared", "/a/{id:int}", "/b/{id:int}", methods="post")
+    assert first is not second
+    assert first.methods is second.methods is router.plain["/only-post"][0].methods
+    assert isinstance(first.methods, frozenset)
+    assert first.params is second.params
+    with pytest.raises(TypeError):
+        first.params["id"] = str
+
     with pytest.raises(router.InvalidMethodError):
         assert router("/only-post")
 
@@ -326,6 +335,501 @@ def test_nested_routers():
     assert match.target == "child_url"
 
 
+def test_hosts():
+    from http_router import Router
+
+    router = Router()
+    router.route("/")("default")
+    router.route("/", host="example.com")("exact")
+    router.route("/", "/items/{item:int}", host="{tenant}.example.com")("tenant")
+
+    assert router.hosts["example.com"]
+    assert len(router.dynamic_hosts) == 1
+    assert router.host_router("{tenant}.example.com") is router.dynamic_hosts[0].target
+
+    assert router("/").target == "default"
+    assert router("/", host="example.com").target == "exact"
+    assert router("/", host="EXAMPLE.com").target == "exact"
+    assert router("/", host="unknown.org").target == "default"
+
+    match = router("/", host="foo.example.com")
+    assert match.target == "tenant"
+    assert match.params == {"tenant": "foo"}
+
+    match = router("/items/42", host="foo.example.com")
+    assert match.params == {"tenant": "foo", "item": 42}
+
+    # Parametrized hosts don't cross dots
+    assert router("/", host="foo.bar.example.com").target == "default"
+
+    with pytest.raises(router.NotFoundError):
+        router("/items/42", host="example.com")
+
+    # Only the literals of host templates are case-insensitive
+    router.route("/case", host="{Tenant}.Example.COM")("case")
+    assert router.host_router("{Tenant}.example.com") is router.dynamic_hosts[-1].target
+    match = router("/case", host="Foo.EXAMPLE.com")
+    assert match.target == "case"
+    assert match.params == {"Tenant": "foo"}
+
+    # Ports are ignored
+    assert router("/", host="example.com:8000").target == "exact"
+    assert router("/", host=b"foo.example.com:443").params == {"tenant": "foo"}
+
+    # Host routes which don't accept the method are used only as a fallback
+    router.route("/a", host="example.com", methods="POST")("exact-post")
+    router.route("/a")("default-a")
+    router.route("/b", host="example.com", methods="POST")("exact-b")
+    assert router("/a", "GET", host="example.com").target == "default-a"
+    assert router("/a", "POST", host="example.com").target == "exact-post"
+    with pytest.raises(router.InvalidMethodError):
+        router("/b", "GET", host="example.com")
+
+    targets = {route.target for route in router.routes()}
+    assert {"exact", "tenant", "exact-post", "default-a"} <= targets
+
+
+def test_raw_paths():
+    from http_router import Router
+
+    router = Router(trim_last_slash=True)
+    router.route("/plain", methods="post")("plain")
+    router.route("/users/{name}/{id:int}")("user")
+    router.route(re(r"/regex/(?P<item>\w+)"))("regex")
+
+    subrouter = Router()
+    subrouter.route("/items/{item}")("item")
+    router.route("/api")(subrouter)
+
+    assert router.plain_raw[b"/plain"] is router.plain["/plain"]
+    assert router(b"/plain/", "POST").target == "plain"
+
+    with pytest.raises(router.InvalidMethodError):
+        router(b"/plain")
+
+    match = router(b"/users/caf%C3%A9/42")
+    assert match.target == "user"
+    assert match.params == {"name": "café", "id": 42}
+
+    assert router(b"/regex/test").params == {"item": "test"}
+    assert router(b"/api/items/12").params == {"item": "12"}
+    assert router(b"/api/items/12", host=b"example.com").target == "item"
+
+    with pytest.raises(router.NotFoundError):
+        router(b"/users/mike/unknown")
+
+    # Raw paths are compared with the percent-encoded templates
+    router.route("/café", "/a b/{tail:path}")("quoted")
+    assert router(b"/caf%C3%A9").target == "quoted"
+    assert router(b"/a%20b/c%20d").params == {"tail": "c d"}
+
+    # Templates with the same raw form are merged
+    router.route("/x y", methods="get")("space")
+    router.route("/x%20y", methods="post")("quoted-plain")
+    assert [route.target for route in router.plain_raw[b"/x%20y"]] == ["space", "quoted-plain"]
+    assert router(b"/x%20y").target == "space"
+    assert router(b"/x%20y", "POST").target == "quoted-plain"
+
+    router.route("/café/{x}", "/a b/{x:int}/é.json")("quoted-dynamic")
+    assert router("/café/1").params == {"x": "1"}
+    assert router(b"/caf%C3%A9/1").params == {"x": "1"}
+    assert router(b"/a%20b/42/%C3%A9.json").params == {"x": 42}
+
+    # Percent escapes are compared case-sensitively (see Router(normalize=True))
+    with pytest.raises(router.NotFoundError):
+        router(b"/caf%c3%a9/1")
+
+    router = Router(normalize=True)
+    router.route("/café/{x}")("quoted-dynamic")
+    assert router(b"/caf%c3%a9/1").redirect == b"/caf%C3%A9/1"
+
+
+def test_tail_routes():
+    from http_router import Router
+    from http_router.routes import TailRoute
+    from http_router.utils import parse_path, split_tail
+
+    assert split_tail(*parse_path("/static/{file:path}")[:2]) == ("/static/", "file")
+    assert split_tail(*parse_path("/{file:path}")[:2]) == ("/", "file")
+    assert split_tail(*parse_path("/{dir}/{file:path}")[:2]) is None
+    assert split_tail(*parse_path("/{file:path}.css")[:2]) is None
+    assert split_tail(*parse_path("/{file}")[:2]) is None
+
+    router = Router()
+    router.route("/{path:path}")("fallback")
+    router.route("/static/{file:path}", methods="GET")("static")
+    router.route("/items/{item}")("item")
+
+    assert not router.dynamic[1:]
+    assert isinstance(router.tails["/static/"][0], TailRoute)
+    assert router.tail_lengths == [8, 1]
+    assert len(router.routes()) == 3
+
+    match = router("/static/css/main.css")
+    assert match.target == "static"
+    assert match.params == {"file": "css/main.css"}
+
+    match = router(b"/static/caf%C3%A9.css")
+    assert match.params == {"file": "café.css"}
+
+    assert router("/static/").params == {"file": ""}
+    assert router("/items/42").target == "item"
+    assert router("/items/42/unknown").target == "fallback"
+    assert router("/static/main.css", "POST").target == "fallback"
+
+    # Longer prefixes don't repeat the routes of the shorter ones
+    assert [route.target for route in router.tail_routes("/")] == ["fallback"]
+    assert [route.target for route in router.tail_routes(b"/static/")] == ["static", "fallback"]
+
+    # Raw prefixes keep their own lengths
+    router.route("/éé/{path:path}")("accent")
+    assert router.tail_lengths == [8, 4, 1]
+    assert router.raw_tail_lengths == [14, 8, 1]
+    assert router(b"/%C3%A9%C3%A9/main.css").target == "accent"
+
+    # Prefixes with the same raw form are merged
+    router.route("/a b/{path:path}")("space")
+    router.route("/a%20b/{path:path}")("quoted")
+    assert [route.target for route in router.tails[b"/a%20b/"]] == ["space", "quoted"]
+    assert router("/a b/x").target == "space"
+    assert router("/a%20b/x").target == "quoted"
+
+
+def test_analyze():
+    from http_router import Router
+    from http_router.analysis import covers, segments
+
+    router = Router()
+    router.route("/users/{id}")("id")
+    router.route("/users/{id:int}")("int")
+    router.route("/users/{name}", methods="GET")("name")
+    router.route("/users/me", methods="POST")("me")
+    router.route("/users/me")("me2")
+    router.route("/items/{id:int}", methods="GET")("get")
+    router.route("/items/{id:int}", methods=["GET", "POST"])("post")
+    router.route("/static/{file:path}")("static")
+    router.route("/static/{path:path}")("static2")
+    router.route(re(r"/regex/(?P<item>\w+)"))("regex")
+    router.route(re(r"/regex/(?P<item>\w+)"))("regex2")
+
+    dynamic = router.dynamic
+    assert segments(dynamic[0]) == [("", ""), ("", "users"), ("str", "id")]
+    assert segments(dynamic[1]) == [("", ""), ("", "users"), ("int", "id")]
+    assert covers(dynamic[0], dynamic[1])
+    assert not covers(dynamic[1], dynamic[0])
+
+    issues = {(issue.kind, issue.route.target, issue.other.target) for issue in router.analyze()}
+    assert issues == {
+        ("shadowed", "int", "id"),
+        ("duplicate", "name", "id"),
+        ("ambiguous", "me2", "me"),
+        ("ambiguous", "post", "get"),
+        ("duplicate", "static2", "static"),
+        ("duplicate", "regex2", "regex"),
+        ("ambiguous", "id", "me"),
+        ("ambiguous", "name", "me"),
+    }
+
+    pruned = router.prune()
+    assert {route.target for route in pruned} == {"int", "name", "static2", "regex2"}
+    assert [route.target for route in router.dynamic] == ["id", "get", "post", "regex"]
+    assert router("/users/42").target == "id"
+    assert router("/static/main.css").target == "static"
+
+    # The routes bound to hosts are analyzed too
+    router = Router()
+    router.route("/users", host="example.com")("users")
+    router.route("/users", host="example.com")("users2")
+    router.route("/{id}", host="{tenant}.example.com")("id")
+    router.route("/{pk}", host="{tenant}.example.com")("pk")
+    assert [(issue.kind, issue.route.target) for issue in router.analyze()] == [
+        ("duplicate", "users2"),
+        ("duplicate", "pk"),
+    ]
+    assert {route.target for route in router.prune()} == {"users2", "pk"}
+    assert not router.analyze()
+    assert router("/1", host="acme.example.com").target == "id"
+
+    router = Router(strict=True)
+    router.route("/users/{id:int}")("int")
+    router.route("/users/{id}")("id")
+    router.route("/users/me")("me")
+
+    with pytest.raises(router.RouterError):
+        router.route("/users/{pk:int}")("pk")
+
+    with pytest.raises(router.RouterError):
+        router.route("/users/me", methods="GET")("me2")
+
+    # Nothing is registered when any of the paths is rejected
+    with pytest.raises(router.RouterError):
+        router.route("/ok", "/users/me")("ok")
+    with pytest.raises(router.RouterError):
+        router.route("/items/{id}", "/items/{pk}")("items")
+    assert {route.target for route in router.routes()} == {"int", "id", "me"}
+
+
+def test_compiler(tmp_path):
+    from uuid import UUID
+
+    from http_router import Router
+    from http_router.compiler import compile_router
+    from http_router.shadow import compare
+
+    router = Router()
+    router.route("/", "/users")("plain")
+    router.route("/users/{id:int}", methods="GET")("user")
+    router.route("/users/{name}")("name")
+    router.route("/posts/{id:int}", methods="GET")("post")
+    router.route("/items/{price:float}/{uid:uuid}")("item")
+    router.route("/files/{name}.json")("json")
+    router.route(re(r"/regex/(?P<item>\w+)"))("regex")
+    router.route("/static/{file:path}", methods="GET")("static")
+    subrouter = Router()
+    subrouter.route("/items/{item}")("subitem")
+    router.route("/api")(subrouter)
+
+    match = compile_router(router)
+    assert "parts[2].isdecimal()" in match.__source__
+    assert "branch = " in match.__source__
+    paths = [
+        "/",
+        "/users",
+        "/users/42",
+        "/posts/42",
+        "/posts/me",
+        "/users/42\n",
+        "/users/caf%C3%A9",
+        "/users/",
+        "/items/4.2/12345678-1234-1234-1234-123456789012",
+        "/items/4./12345678-1234-1234-1234-123456789012",
+        "/files/readme.json",
+        "/regex/test",
+        "/static/css/main.css",
+        "/api/items/12",
+        "/unknown",
+        b"/users/42",
+    ]
+    for path in paths:
+        for method in ("GET", "POST"):
+            result = match(path, method)
+            assert result is not None
+            assert not compare(router.match(path, method), result), (path, method)
+
+    assert match("/items/4.2/12345678-1234-1234-1234-123456789012", "GET").params == {
+        "price": 4.2,
+        "uid": UUID("12345678-1234-1234-1234-123456789012"),
+    }
+
+    cached = compile_router(router, cache_dir=tmp_path)
+    assert list(tmp_path.iterdir())
+    cached = compile_router(router, cache_dir=tmp_path)
+    assert cached("/users/42", "GET").target == "user"
+    assert not [path for path in tmp_path.iterdir() if path.suffix == ".tmp"]
+
+    # The cache is optional
+    (tmp_path / "file").touch()
+    cached = compile_router(router, cache_dir=tmp_path / "file")
+    assert cached("/users/42", "GET").target == "user"
+
+
+def random_table(rnd):
+    """Generate random route templates which overlap a lot."""
+    literals = ["", "a", "b", "users", "42"]
+    variables = ["{{{}}}", "{{{}:int}}", "{{{}:float}}", "{{{}:str}}", "{{{}:[ab]+}}"]
+
+    templates = []
+    for _ in range(rnd.randint(1, 30)):
+        parts, names = [], iter("xyzuvw")
+        for _ in range(rnd.randint(1, 4)):
+            if rnd.random() < 0.5:
+                parts.append(rnd.choice(literals))
+            else:
+                parts.append(rnd.choice(variables).format(next(names)))
+        if rnd.random() < 0.2:
+            parts.append(f"{{{next(names)}:path}}")
+        templates.append(("/" + "/".join(parts), rnd.choice([None, "GET", ["GET", "POST"]])))
+
+    return templates
+
+
+def random_paths(rnd, count=100):
+    values = ["", "a", "b", "ab", "users", "42", "4.2", "caf%C3%A9", "a.b", "-1"]
+    return [
+        "/" + "/".join(rnd.choice(values) for _ in range(rnd.randint(0, 5)))
+        for _ in range(count)
+    ]
+
+
+def load_pure_package():
+    """Load the pure python build when the Cython one is active (or None)."""
+    import importlib.util
+    import sys
+    from importlib.machinery import SOURCE_SUFFIXES, FileFinder, SourceFileLoader
+    from pathlib import Path
+
+    import http_router.router
+
+    if http_router.router.__file__.endswith(".py"):
+        return None
+
+    name = "http_router_pure"
+    root = Path(http_router.router.__file__).parent
+    finder = FileFinder(str(root), (SourceFileLoader, SOURCE_SUFFIXES))
+
+    class PureFinder:
+        @staticmethod
+        def find_spec(fullname, *_):
+            return finder.find_spec(fullname) if fullname.startswith(f"{name}.") else None
+
+    spec = importlib.util.spec_from_file_location(
+        name, root / "__init__.py", submodule_search_locations=[],
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    sys.meta_path.insert(0, PureFinder)
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        sys.meta_path.remove(PureFinder)
+
+    return module
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_engines_equivalence(seed):
+    import random
+
+    from http_router import Router
+    from http_router.compiler import compile_router
+    from http_router.shadow import compare
+
+    rnd = random.Random(seed)
+    table = random_table(rnd)
+    pure = load_pure_package()
+
+    routers = [Router() for _ in range(2)]
+    if pure is not None:
+        routers.append(pure.Router())
+
+    for idx, (template, methods) in enumerate(table):
+        for router in routers:
+            router.route(template, methods=methods)(idx)
+
+    router, *others = routers
+    engines = [compile_router(others[0])] + [other.match for other in others[1:]]
+
+    for path in random_paths(rnd):
+        for method in ("GET", "POST"):
+            expected = router.match(path, method)
+            for engine in engines:
+                assert not compare(expected, engine(path, method)), (table, path, method)
+
+
+def test_shadow(caplog):
+    from http_router import Router
+    from http_router.compiler import compile_router
+    from http_router.shadow import Shadow
+
+    router = Router(trim_last_slash=True)
+    router.route("/users/{id:int}", methods="GET")("user")
+    router.route("/static/{file:path}")("static")
+
+    shadow = Shadow(router, compile_router(router), rate=1)
+    assert shadow("/users/42/", "GET").params == {"id": 42}
+    assert shadow("/static/main.css").target == "static"
+
+    with pytest.raises(router.NotFoundError):
+        shadow("/unknown")
+
+    with pytest.raises(router.InvalidMethodError):
+        shadow("/users/42", "POST")
+
+    assert shadow.sampled == 4
+    assert not shadow.mismatches
+    assert set(shadow.latency()) == {"primary", "candidate"}
+
+    broken = Router()
+    broken.route("/users/{id}")("user")
+    shadow = Shadow(router, compile_router(broken), rate=1)
+    assert shadow("/users/42", "GET").params == {"id": 42}
+    assert shadow.mismatches == 1
+    assert "params" in caplog.text
+
+    shadow = Shadow(router, compile_router(broken), rate=0)
+    assert shadow("/users/42", "GET")
+    assert not shadow.sampled
+
+    # The router is timed without its cache, the same way as the candidate
+    shadow = Shadow(router, compile_router(router), rate=1)
+    cache = type(router).match.cache_info()
+    assert shadow("/users/42", "GET")
+    assert type(router).match.cache_info() == cache
+
+    def failing(*_):
+        raise RuntimeError("candidate")
+
+    shadow = Shadow(router, failing, rate=1)
+    assert shadow("/users/42", "GET").target == "user"
+    assert shadow.mismatches == 1
+    assert "RuntimeError" in caplog.text
+
+
+def test_normalize():
+    from http_router import Router
+    from http_router.compiler import compile_router
+    from http_router.routes import RouteMatch
+    from http_router.shadow import compare
+    from http_router.utils import normalize_path, normalize_template
+
+    assert normalize_path("/") == "/"
+    assert normalize_path("/a//b/./c/../d/") == "/a/b/d/"
+    assert normalize_path("/a/b/..") == "/a/"
+    assert normalize_path("/../a") == "/a"
+    assert normalize_path("/a/%2fb%c3%a9") == "/a/%2Fb%C3%A9"
+    assert normalize_path(b"//a/./b") == b"/a/b"
+    assert normalize_path("test.jpg") == "test.jpg"
+
+    router = Router(normalize=True, trim_last_slash=True)
+    router.route("/users//list/")("list")
+    router.route("/users/{name}")("user")
+    router.route("/files/%2F")("escaped")
+
+    match = router("/users/list")
+    assert match.target == "list"
+    assert match.redirect is None
+
+    match = router("//users/./list/")
+    assert match.target == "list"
+    assert match.redirect == "/users/list"
+
+    match = router("/users/../users/mike")
+    assert match.params == {"name": "mike"}
+    assert match.redirect == "/users/mike"
+
+    assert router(b"/files/%2f").redirect == b"/files/%2F"
+
+    with pytest.raises(router.NotFoundError):
+        router("/users/mike/../../unknown")
+
+    # Literals of the templates are normalized as well, the last slash is trimmed after
+    assert normalize_template("/caf%c3%a9/./{x:\\d{2}}/../{y}") == "/caf%C3%A9/{y}"
+    router.route("/caf%c3%a9/{x}")("cafe")
+    router.route("/a/b/..")("up")
+    assert router("/caf%c3%a9/1").params == {"x": "1"}
+    assert router("/caf%c3%a9/1").redirect == "/caf%C3%A9/1"
+    assert router.plain["/a"][0].target == "up"
+    assert router("/a/").target == "up"
+
+    match = compile_router(router)
+    assert match("//users/./list/", "GET").redirect == "/users/list"
+    assert match("/users/list", "GET").target == "list"
+
+    expected = router("/users//list")
+    assert compare(expected, RouteMatch(True, True, "list")).startswith("redirect")
+    assert not compare(expected, match("/users//list", "GET"))
+
+
 def test_readme():
     from http_router import Router
 
@@ -377,6 +881,61 @@ def test_benchmark(router, benchmark):
     benchmark(do_work)
 
 
+def test_benchmark_memory():
+    """Keep large route tables compact."""
+    import random
+    import string
+    import tracemalloc
+
+    from http_router import Router
+
+    chars = string.ascii_letters + string.digits
+    randpath = lambda: "".join(random.choices(chars, k=10))  # noqa: E731
+    methods = "GET", "POST"
+
+    routes = [f"/{ randpath() }/{ randpath() }" for _ in range(5000)]
+    routes += [f"/{ randpath() }/{{item:int}}/{ randpath() }" for _ in range(5000)]
+    routes += routes[-1000:]  # identical templates share the compiled patterns
+
+    tracemalloc.start()
+    try:
+        router = Router()
+        for route in routes:
+            router.route(route, methods=random.choice(methods))("OK")
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert size / len(routes) < 768
+
+
+def test_benchmark_compiled(router, benchmark):
+    import random
+    import string
+
+    from http_router.compiler import compile_router
+
+    chars = string.ascii_letters + string.digits
+    randpath = lambda: "".join(random.choices(chars, k=10))  # noqa: E731
+    methods = "GET", "POST"
+
+    routes = [f"/{ randpath() }/{ randpath() }" for _ in range(100)]
+    routes += [f"/{ randpath() }/{{item}}/{ randpath() }" for _ in range(100)]
+    random.shuffle(routes)
+
+    for route in routes:
+        router.route(route, methods=random.choice(methods))("OK")
+
+    paths = [route.format(item=randpath()) for route in routes]
+    match = compile_router(router)
+
+    def do_work():
+        for path in paths:
+            assert match(path, "GET").path
+
+    benchmark(do_work)
+
+
 def test_readme_examples():
     from http_router import Router
 